@@ -6,70 +6,298 @@ Accepts a CSV file path as a command-line argument
 
 import csv
 import json
+import os
 import sys
 import argparse
-from datetime import datetime
-from collections import defaultdict
+from bisect import bisect_right
+from datetime import date, datetime, timedelta, timezone
+from collections import Counter, defaultdict
+from itertools import compress
 from statistics import mean, median
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# numpy, pandas and pyarrow are slow to import, so they are only loaded
+# by import_vectorized() once a file is big enough to benefit from them
+np = None
+pd = None
+pa = None
+pacsv = None
+pc = None
+
+# CSV header -> event field
+COLUMNS = {
+    'Date': 'date',
+    'Kind': 'kind',
+    'Model': 'model',
+    'Max Mode': 'max_mode',
+    'Input (w/ Cache Write)': 'input_cache',
+    'Input (w/o Cache Write)': 'input_no_cache',
+    'Cache Read': 'cache_read',
+    'Output Tokens': 'output_tokens',
+    'Total Tokens': 'total_tokens',
+    'Cost': 'cost',
+}
+
+WEEKDAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+# Unix epoch, for turning epoch microseconds and days back into datetimes and dates
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+EPOCH_ORDINAL = EPOCH.toordinal()
+
+# Thresholds and suffixes for format_number
+NUMBER_SCALES = (1_000, 1_000_000, 1_000_000_000)
+NUMBER_SUFFIXES = ('K', 'M', 'B')
+
+# Box drawing for format_box, built once for the fixed width
+BOX_WIDTH = 70
+BOX_TOP = "┌" + "─" * (BOX_WIDTH - 2) + "┐"
+BOX_DIVIDER = "├" + "─" * (BOX_WIDTH - 2) + "┤"
+BOX_BOTTOM = "└" + "─" * (BOX_WIDTH - 2) + "┘"
+BOX_ROW = f"│ {{:<{BOX_WIDTH - 4}}} │".format
+
+# Files smaller than this are parsed with the csv module, where the
+# import time of pandas would outweigh its faster parsing
+VECTORIZE_MIN_BYTES = 8_000_000
+
+# Rows per DataFrame when streaming the CSV with pandas
+CHUNK_SIZE = 200_000
+
+TOKEN_COLUMNS = [
+    'Input (w/ Cache Write)',
+    'Input (w/o Cache Write)',
+    'Cache Read',
+    'Output Tokens',
+    'Total Tokens',
+]
+
+# Fields that count as a missing (zero) value in each numeric column
+MISSING_VALUES = {col: [''] for col in TOKEN_COLUMNS}
+MISSING_VALUES['Cost'] = ['', 'NaN']
+
+def cast_columns(batch):
+    """Cast the date and numeric columns of an Arrow batch, leaving any column with a bad field as strings"""
+    blank = pa.scalar(None, pa.string())
+    arrays = []
+    for name, array in zip(batch.schema.names, batch.columns):
+        if name == 'Date':
+            try:
+                array = array.cast(pa.timestamp('us', 'UTC'))
+            except pa.ArrowInvalid:
+                pass
+        elif name in MISSING_VALUES:
+            present = pc.if_else(pc.equal(array, ''), blank, array)
+            try:
+                array = present.cast(pa.float64() if name == 'Cost' else pa.int64())
+            except pa.ArrowInvalid:
+                pass
+        arrays.append(array)
+    return pa.RecordBatch.from_arrays(arrays, names=batch.schema.names)
+
+def read_csv_arrow(filename):
+    """Stream the CSV file in blocks with pyarrow's multi-threaded parser"""
+    # Date and numeric columns are read as strings and cast per batch, so one
+    # bad field only leaves its column for parse_csv_chunks to coerce
+    column_types = {col: pa.string() for col in MISSING_VALUES}
+    column_types.update({
+        'Date': pa.string(),
+        'Kind': pa.dictionary(pa.int32(), pa.string()),
+        'Model': pa.dictionary(pa.int32(), pa.string()),
+        'Max Mode': pa.dictionary(pa.int32(), pa.string()),
+    })
+    
+    # pyarrow can only skip rows with the wrong number of fields; keep
+    # their text and pad or trim them afterwards, like the stdlib reader
+    uneven_rows = []
+    
+    def keep_uneven_row(row):
+        uneven_rows.append(row.text)
+        return 'skip'
+    
+    reader = pacsv.open_csv(
+        filename,
+        read_options=pacsv.ReadOptions(block_size=8 << 20),
+        parse_options=pacsv.ParseOptions(invalid_row_handler=keep_uneven_row),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=list(COLUMNS),
+            column_types=column_types,
+        ),
+    )
+    for batch in reader:
+        yield cast_columns(batch).to_pandas()
+    
+    if uneven_rows:
+        with open(filename, 'r', newline='', encoding='utf-8-sig') as f:
+            header = next(csv.reader(f))
+        width = len(header)
+        index = {col: header.index(col) for col in COLUMNS}
+        rows = [row + [''] * (width - len(row)) for row in csv.reader(uneven_rows)]
+        df = pd.DataFrame({col: [row[index[col]] for row in rows] for col in COLUMNS})
+        yield df.astype({'Kind': 'category', 'Model': 'category', 'Max Mode': 'category'})
+
+def parse_csv_chunks(filename):
+    """Parse the CSV file into a stream of typed DataFrames using pandas"""
+    if pa is not None:
+        chunks = read_csv_arrow(filename)
+    else:
+        # Numeric columns are left to the C parser's own inference; a typed
+        # (nullable) parse is much slower and aborts the file on one bad field
+        dtype = {'Kind': 'category', 'Model': 'category', 'Max Mode': 'category'}
+        
+        # Only numeric columns treat empty fields as missing, so every model keeps a category
+        chunks = pd.read_csv(
+            filename,
+            usecols=list(COLUMNS),
+            dtype=dtype,
+            na_values=MISSING_VALUES,
+            keep_default_na=False,
+            chunksize=CHUNK_SIZE,
+            low_memory=False,
+        )
+    
+    for df in chunks:
+        # Parse dates as UTC and skip rows that don't parse, like the stdlib reader
+        if not pd.api.types.is_datetime64_any_dtype(df['Date']):
+            df['Date'] = pd.to_datetime(df['Date'], format='ISO8601', utc=True, errors='coerce')
+        invalid = df['Date'].isna()
+        
+        # A column only comes back non-numeric when some field in it isn't a
+        # number; skip those rows too, but not missing fields
+        for col in MISSING_VALUES:
+            if not pd.api.types.is_numeric_dtype(df[col]):
+                values = pd.to_numeric(df[col], errors='coerce')
+                invalid |= values.isna() & df[col].notna() & ~df[col].isin(MISSING_VALUES[col])
+                df[col] = values
+        
+        # Token counts must be whole numbers, as int() requires on the stdlib path
+        for col in TOKEN_COLUMNS:
+            if df[col].dtype.kind == 'f':
+                invalid |= df[col].notna() & (df[col] % 1 != 0)
+        
+        if invalid.any():
+            df = df[~invalid.to_numpy()]
+        
+        # Missing token counts and NaN costs count as zero
+        df[TOKEN_COLUMNS] = df[TOKEN_COLUMNS].fillna(0).astype('int64')
+        df['Cost'] = df['Cost'].fillna(0.0)
+        
+        yield df.rename(columns=COLUMNS)
+
+def ends_in_quoted_field(filename):
+    """Check whether the file stops inside a quoted field, as a cut-off download can"""
+    quotes = 0
+    with open(filename, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            quotes += block.count(b'"')
+    return quotes % 2 == 1
+
+def import_vectorized():
+    """Import numpy, pandas and (optionally) pyarrow, returning False if pandas is unavailable"""
+    global np, pd, pa, pacsv, pc
+    
+    try:
+        import numpy as np
+        import pandas as pd
+    except ImportError:
+        return False
+    
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        from pyarrow import csv as pacsv
+    except ImportError:
+        pa = None
+    
+    return True
+
 def parse_csv(filename):
     """Parse the CSV file and return structured data"""
-    events = []
+    if os.path.getsize(filename) >= VECTORIZE_MIN_BYTES and import_vectorized():
+        # pandas' own parser gives up on a final row cut off inside quotes,
+        # which pyarrow and the csv module both still read
+        if pa is not None or not ends_in_quoted_field(filename):
+            return parse_csv_chunks(filename)
     
-    with open(filename, 'r') as f:
-        reader = csv.DictReader(f)
+    rows = []
+    
+    with open(filename, 'r', newline='', buffering=1 << 20, encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        
+        # Resolve column positions from the header once
+        header = next(reader, None)
+        if header is not None:
+            (i_date, i_kind, i_model, i_max_mode, i_input_cache, i_input_no_cache,
+             i_cache_read, i_output_tokens, i_total_tokens, i_cost) = [header.index(col) for col in COLUMNS]
+            width = len(header)
+        
         for row in reader:
+            # Short rows read as missing fields, like DictReader's None
+            if len(row) < width:
+                row += [''] * (width - len(row))
+            
             # Parse date
             try:
-                date_str = row['Date'].strip('"')
-                date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+                date_str = row[i_date].strip('"')
+                event_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
             except:
                 continue
             
+            # Bucket on UTC, as the pandas path does, whatever offset the row has
+            if event_date.utcoffset():
+                event_date = event_date.astimezone(timezone.utc)
+            
             # Parse numeric fields
             try:
-                input_cache = int(row['Input (w/ Cache Write)']) if row['Input (w/ Cache Write)'] else 0
-                input_no_cache = int(row['Input (w/o Cache Write)']) if row['Input (w/o Cache Write)'] else 0
-                cache_read = int(row['Cache Read']) if row['Cache Read'] else 0
-                output_tokens = int(row['Output Tokens']) if row['Output Tokens'] else 0
-                total_tokens = int(row['Total Tokens']) if row['Total Tokens'] else 0
-                cost = float(row['Cost']) if row['Cost'] and row['Cost'] != 'NaN' else 0.0
+                input_cache = int(row[i_input_cache]) if row[i_input_cache] else 0
+                input_no_cache = int(row[i_input_no_cache]) if row[i_input_no_cache] else 0
+                cache_read = int(row[i_cache_read]) if row[i_cache_read] else 0
+                output_tokens = int(row[i_output_tokens]) if row[i_output_tokens] else 0
+                total_tokens = int(row[i_total_tokens]) if row[i_total_tokens] else 0
+                cost = float(row[i_cost]) if row[i_cost] and row[i_cost] != 'NaN' else 0.0
             except:
                 continue
             
-            events.append({
-                'date': date,
-                'kind': row['Kind'],
-                'model': row['Model'],
-                'max_mode': row['Max Mode'],
-                'input_cache': input_cache,
-                'input_no_cache': input_no_cache,
-                'cache_read': cache_read,
-                'output_tokens': output_tokens,
-                'total_tokens': total_tokens,
-                'cost': cost
-            })
-    
-    return events
-
-def analyze_usage(events):
-    """Analyze usage patterns and generate statistics"""
+            # Same field order as COLUMNS
+            rows.append((
+                event_date,
+                row[i_kind],
+                row[i_model],
+                row[i_max_mode],
+                input_cache,
+                input_no_cache,
+                cache_read,
+                output_tokens,
+                total_tokens,
+                cost
+            ))
     
-    # Filter out errored events
-    valid_events = [e for e in events if e['kind'] == 'Included' and e['total_tokens'] > 0]
-    
-    stats = {
-        'total_events': len(valid_events),
+    # Store events column-wise, one list per field
+    columns = zip(*rows) if rows else ([] for _ in COLUMNS)
+    return {field: list(values) for field, values in zip(COLUMNS.values(), columns)}
+
+def add_buckets(bucket, totals, key, cast=int):
+    """Add the non-empty bincount totals into a running bucket dict"""
+    for i in np.flatnonzero(totals):
+        bucket[key(i)] += cast(totals[i])
+
+def new_stats():
+    """Return empty statistics, in the shape both analysis paths fill in"""
+    return {
+        'loaded_events': 0,
+        'total_events': 0,
         'date_range': {
-            'start': min(e['date'] for e in valid_events),
-            'end': max(e['date'] for e in valid_events)
+            'start': None,
+            'end': None
         },
-        'total_tokens': sum(e['total_tokens'] for e in valid_events),
-        'total_output_tokens': sum(e['output_tokens'] for e in valid_events),
-        'total_input_tokens': sum(e['input_cache'] + e['input_no_cache'] for e in valid_events),
-        'total_cache_read': sum(e['cache_read'] for e in valid_events),
-        'total_cost': sum(e['cost'] for e in valid_events),
-        'model_usage': defaultdict(int),
+        'total_tokens': 0,
+        'total_output_tokens': 0,
+        'total_input_tokens': 0,
+        'total_cache_read': 0,
+        'total_cost': 0.0,
+        'model_usage': Counter(),
         'model_tokens': defaultdict(int),
         'model_cost': defaultdict(float),
         'hourly_usage': defaultdict(int),
@@ -77,50 +305,175 @@ def analyze_usage(events):
         'monthly_usage': defaultdict(int),
         'weekday_usage': defaultdict(int),
         'token_distribution': [],
-        'cache_efficiency': [],
+        'cache_ratio_total': 0.0,
+        'cache_ratio_count': 0,
     }
+
+def update_stats(df, stats):
+    """Fold one parsed DataFrame chunk into the running statistics"""
+    
+    stats['loaded_events'] += len(df)
+    
+    # Filter out errored events
+    valid = ((df['kind'] == 'Included') & (df['total_tokens'] > 0)).to_numpy()
+    if not valid.any():
+        return
+    
+    # Only the columns the analysis reads, as contiguous arrays
+    dates = df['date'].values[valid].astype('datetime64[us]')
+    tokens = df['total_tokens'].to_numpy()[valid]
+    cost = df['cost'].to_numpy()[valid]
+    models = df['model'].array[valid]
+    output_tokens = df['output_tokens'].to_numpy()[valid]
+    input_cache = df['input_cache'].to_numpy()[valid]
+    input_no_cache = df['input_no_cache'].to_numpy()[valid]
+    cache_read = df['cache_read'].to_numpy()[valid]
+    
+    # Epoch microseconds, shared by the date range and the time buckets
+    micros = dates.view(np.int64)
+    
+    date_range = stats['date_range']
+    start, end = int(micros.min()), int(micros.max())
+    if date_range['start'] is None or start < date_range['start']:
+        date_range['start'] = start
+    if date_range['end'] is None or end > date_range['end']:
+        date_range['end'] = end
+    
+    stats['total_events'] += len(tokens)
+    stats['total_tokens'] += int(tokens.sum())
+    stats['total_output_tokens'] += int(output_tokens.sum())
+    stats['total_input_tokens'] += int(input_cache.sum() + input_no_cache.sum())
+    stats['total_cache_read'] += int(cache_read.sum())
+    stats['total_cost'] += float(cost.sum())
+    
+    # Integer bucket codes from the UTC epoch, computed once for the whole column
+    hour_codes = micros // 3_600_000_000 % 24
+    days = micros // 86_400_000_000
+    weekday_codes = (days + 3) % 7  # 1970-01-01 was a Thursday
+    first_day = days.min()
+    day_codes = days - first_day
+    months = dates.astype('datetime64[M]').view(np.int64) + 1970 * 12
+    first_month = months.min()
+    month_codes = months - first_month
+    model_codes = models.codes
+    
+    # One bincount per bucket instead of a hash lookup per event; the
+    # token weights are converted to float64 once instead of per call
+    weights = tokens.astype(np.float64)
+    n_models = len(models.categories)
+    model_name = models.categories.__getitem__
+    add_buckets(stats['model_usage'], np.bincount(model_codes, minlength=n_models), model_name)
+    add_buckets(stats['model_tokens'], np.bincount(model_codes, weights=weights, minlength=n_models), model_name)
+    add_buckets(stats['model_cost'], np.bincount(model_codes, weights=cost, minlength=n_models), model_name, float)
+    add_buckets(stats['hourly_usage'], np.bincount(hour_codes, weights=weights, minlength=24), int)
+    add_buckets(stats['weekday_usage'], np.bincount(weekday_codes, weights=weights, minlength=7), int)
+    add_buckets(stats['daily_usage'], np.bincount(day_codes, weights=weights), lambda i: int(first_day + i))
+    add_buckets(stats['monthly_usage'], np.bincount(month_codes, weights=weights), lambda i: int(first_month + i))
+    
+    # Cache efficiency; only the mean ratio is reported, so keep a running sum and count
+    total_input = input_cache + input_no_cache + cache_read
+    has_input = total_input > 0
+    stats['cache_ratio_total'] += float((cache_read[has_input] / total_input[has_input]).sum())
+    stats['cache_ratio_count'] += int(has_input.sum())
+    
+    stats['token_distribution'].append(tokens.astype(np.int64))
+
+def analyze_chunks(chunks):
+    """Analyze usage patterns from a stream of parsed DataFrame chunks"""
+    
+    stats = new_stats()
+    for df in chunks:
+        update_stats(df, stats)
+    
+    # The date range and time buckets stay plain integers until every chunk
+    # is merged; only the final values become datetimes, dates and labels
+    date_range = stats['date_range']
+    if date_range['start'] is not None:
+        date_range['start'] = EPOCH + timedelta(microseconds=date_range['start'])
+        date_range['end'] = EPOCH + timedelta(microseconds=date_range['end'])
+    stats['daily_usage'] = {date.fromordinal(EPOCH_ORDINAL + d): t for d, t in stats['daily_usage'].items()}
+    stats['monthly_usage'] = {format_month(m): t for m, t in stats['monthly_usage'].items()}
+    stats['weekday_usage'] = {WEEKDAY_NAMES[d]: t for d, t in stats['weekday_usage'].items()}
+    
+    # Per-chunk token arrays are only joined once, for the median
+    stats['token_distribution'] = np.concatenate(stats['token_distribution'] or [np.empty(0, np.int64)])
+    
+    return stats
+
+def analyze_usage(events):
+    """Analyze usage patterns and generate statistics"""
+    
+    if not isinstance(events, dict):
+        return analyze_chunks(events)
+    
+    # Filter out errored events
+    valid = [kind == 'Included' and tokens > 0 for kind, tokens in zip(events['kind'], events['total_tokens'])]
+    valid_events = {field: list(compress(values, valid)) for field, values in events.items()}
+    
+    stats = new_stats()
+    stats['loaded_events'] = len(events['date'])
+    stats['total_events'] = len(valid_events['date'])
+    stats['date_range']['start'] = min(valid_events['date'], default=None)
+    stats['date_range']['end'] = max(valid_events['date'], default=None)
+    stats['total_tokens'] = sum(valid_events['total_tokens'])
+    stats['total_output_tokens'] = sum(valid_events['output_tokens'])
+    stats['total_input_tokens'] = sum(valid_events['input_cache']) + sum(valid_events['input_no_cache'])
+    stats['total_cache_read'] = sum(valid_events['cache_read'])
+    stats['total_cost'] = sum(valid_events['cost'])
+    stats['model_usage'].update(valid_events['model'])
+    stats['token_distribution'] = valid_events['total_tokens']
+    
+    # Hoist the buckets out of the loop to skip the stats lookups per event
+    model_tokens = stats['model_tokens']
+    model_cost = stats['model_cost']
+    hourly_usage = stats['hourly_usage']
+    daily_usage = stats['daily_usage']
+    monthly_usage = stats['monthly_usage']
+    weekday_usage = stats['weekday_usage']
+    cache_ratio_total = 0.0
+    cache_ratio_count = 0
     
     # Analyze each event
-    for event in valid_events:
-        model = event['model']
-        date = event['date']
-        
+    for event_date, model, total_tokens, cost, input_cache, input_no_cache, cache_read in zip(
+        valid_events['date'],
+        valid_events['model'],
+        valid_events['total_tokens'],
+        valid_events['cost'],
+        valid_events['input_cache'],
+        valid_events['input_no_cache'],
+        valid_events['cache_read'],
+    ):
         # Model statistics
-        stats['model_usage'][model] += 1
-        stats['model_tokens'][model] += event['total_tokens']
-        stats['model_cost'][model] += event['cost']
+        model_tokens[model] += total_tokens
+        model_cost[model] += cost
         
         # Time-based statistics
-        hour = date.hour
-        day = date.date()
-        month = date.strftime('%Y-%m')
-        weekday = date.strftime('%A')
-        
-        stats['hourly_usage'][hour] += event['total_tokens']
-        stats['daily_usage'][day] += event['total_tokens']
-        stats['monthly_usage'][month] += event['total_tokens']
-        stats['weekday_usage'][weekday] += event['total_tokens']
+        hourly_usage[event_date.hour] += total_tokens
+        daily_usage[event_date.date()] += total_tokens
+        monthly_usage[event_date.year * 12 + event_date.month - 1] += total_tokens
+        weekday_usage[event_date.weekday()] += total_tokens
         
         # Cache efficiency
-        total_input = event['input_cache'] + event['input_no_cache'] + event['cache_read']
+        total_input = input_cache + input_no_cache + cache_read
         if total_input > 0:
-            cache_ratio = event['cache_read'] / total_input
-            stats['cache_efficiency'].append(cache_ratio)
-        
-        # Token distribution
-        stats['token_distribution'].append(event['total_tokens'])
+            cache_ratio_total += cache_read / total_input
+            cache_ratio_count += 1
+    
+    stats['cache_ratio_total'] = cache_ratio_total
+    stats['cache_ratio_count'] = cache_ratio_count
+    
+    # Format month and weekday keys only for the aggregated buckets
+    stats['monthly_usage'] = {format_month(m): t for m, t in stats['monthly_usage'].items()}
+    stats['weekday_usage'] = {WEEKDAY_NAMES[d]: t for d, t in stats['weekday_usage'].items()}
     
     return stats
 
 def format_number(num):
     """Format large numbers nicely"""
-    if num >= 1_000_000_000:
-        return f"{num / 1_000_000_000:.2f}B"
-    elif num >= 1_000_000:
-        return f"{num / 1_000_000:.2f}M"
-    elif num >= 1_000:
-        return f"{num / 1_000:.2f}K"
-    return str(int(num))
+    scale = bisect_right(NUMBER_SCALES, num)
+    if scale == 0:
+        return str(int(num))
+    return f"{num / NUMBER_SCALES[scale - 1]:.2f}{NUMBER_SUFFIXES[scale - 1]}"
 
 def format_hour(hour):
     """Format hour as 12-hour time"""
@@ -133,15 +486,17 @@ def format_hour(hour):
     else:
         return f"{hour - 12}:00 PM"
 
-def print_box(title, content, width=70):
-    """Print a box with title and content"""
-    print("┌" + "─" * (width - 2) + "┐")
-    print(f"│ {title:<{width-4}} │")
-    print("├" + "─" * (width - 2) + "┤")
-    for line in content:
-        print(f"│ {line:<{width-4}} │")
-    print("└" + "─" * (width - 2) + "┘")
-    print()
+def format_month(month):
+    """Format a month bucket (year * 12 + month - 1) as YYYY-MM"""
+    return f"{month // 12}-{month % 12 + 1:02d}"
+
+def format_box(title, content):
+    """Format a box with title and content as output lines"""
+    lines = [BOX_TOP, BOX_ROW(title), BOX_DIVIDER]
+    lines.extend(map(BOX_ROW, content))
+    lines.append(BOX_BOTTOM)
+    lines.append("")
+    return lines
 
 def generate_summary(stats):
     """Generate summary data structure"""
@@ -161,12 +516,40 @@ def generate_summary(stats):
     peak_weekday = max(stats['weekday_usage'].items(), key=lambda x: x[1])
     
     # Cache efficiency
-    avg_cache_efficiency = mean(stats['cache_efficiency']) * 100 if stats['cache_efficiency'] else 0
+    if stats['cache_ratio_count']:
+        avg_cache_efficiency = stats['cache_ratio_total'] / stats['cache_ratio_count'] * 100
+    else:
+        avg_cache_efficiency = 0
     
     # Token stats
-    avg_tokens = mean(stats['token_distribution']) if stats['token_distribution'] else 0
-    median_tokens = median(stats['token_distribution']) if stats['token_distribution'] else 0
-    max_tokens = max(stats['token_distribution']) if stats['token_distribution'] else 0
+    if np is not None:
+        tokens = np.asarray(stats['token_distribution'], dtype=np.int64)
+        avg_tokens = float(tokens.mean()) if tokens.size else 0
+        median_tokens = float(np.median(tokens)) if tokens.size else 0
+        max_tokens = int(tokens.max()) if tokens.size else 0
+    else:
+        avg_tokens = mean(stats['token_distribution']) if stats['token_distribution'] else 0
+        median_tokens = median(stats['token_distribution']) if stats['token_distribution'] else 0
+        max_tokens = max(stats['token_distribution']) if stats['token_distribution'] else 0
+    
+    # Per-model breakdown, by tokens
+    model_usage = stats['model_usage']
+    model_tokens = stats['model_tokens']
+    model_cost = stats['model_cost']
+    total_tokens = stats['total_tokens']
+    model_breakdown = []
+    for model in sorted(model_tokens, key=model_tokens.get, reverse=True):
+        model_total = model_tokens[model]
+        cost = model_cost[model]
+        model_breakdown.append({
+            'model': model,
+            'usage_count': model_usage[model],
+            'total_tokens': model_total,
+            'total_tokens_formatted': format_number(model_total),
+            'cost': cost,
+            'cost_formatted': f"${cost:.2f}",
+            'percentage': round((model_total / total_tokens) * 100, 1) if total_tokens > 0 else 0
+        })
     
     # Calculate tokens per day
     tokens_per_day = stats['total_tokens'] / days_active if days_active > 0 else 0
@@ -216,18 +599,7 @@ def generate_summary(stats):
             'max': max_tokens,
             'max_formatted': format_number(max_tokens)
         },
-        'model_breakdown': [
-            {
-                'model': model,
-                'usage_count': stats['model_usage'][model],
-                'total_tokens': stats['model_tokens'][model],
-                'total_tokens_formatted': format_number(stats['model_tokens'][model]),
-                'cost': stats['model_cost'][model],
-                'cost_formatted': f"${stats['model_cost'][model]:.2f}",
-                'percentage': round((stats['model_tokens'][model] / stats['total_tokens']) * 100, 1) if stats['total_tokens'] > 0 else 0
-            }
-            for model in sorted(stats['model_tokens'].keys(), key=lambda m: stats['model_tokens'][m], reverse=True)
-        ]
+        'model_breakdown': model_breakdown
     }
     
     return summary
@@ -235,11 +607,16 @@ def generate_summary(stats):
 def display_summary(data):
     """Display the summary in a formatted terminal output"""
     
+    # Collect every line and write once at the end
+    out = []
+    
     # Header
-    print("\n" + "=" * 70)
-    print(" " * 20 + "🎉 CURSOR WRAPPED 2025 🎉")
-    print(" " * 25 + "Your Year in Code")
-    print("=" * 70 + "\n")
+    out.append("")
+    out.append("=" * 70)
+    out.append(" " * 20 + "🎉 CURSOR WRAPPED 2025 🎉")
+    out.append(" " * 25 + "Your Year in Code")
+    out.append("=" * 70)
+    out.append("")
     
     # Total Activity
     content = [
@@ -248,7 +625,7 @@ def display_summary(data):
         f"Days Active:        {data['days_active']} days",
         f"Date Range:         {data['date_range']['start']} to {data['date_range']['end']}",
     ]
-    print_box("📊 TOTAL ACTIVITY", content)
+    out.extend(format_box("📊 TOTAL ACTIVITY", content))
     
     # Daily Stats
     content = [
@@ -257,14 +634,14 @@ def display_summary(data):
         f"Median per Request:  {data['token_stats']['median_formatted']}",
         f"Largest Request:     {data['token_stats']['max_formatted']}",
     ]
-    print_box("📈 DAILY STATISTICS", content)
+    out.extend(format_box("📈 DAILY STATISTICS", content))
     
     # Cost
     content = [
         f"Total Cost:         {data['totals']['cost_formatted']}",
         f"Average per Day:    ${data['totals']['cost'] / data['days_active']:.2f}",
     ]
-    print_box("💰 YOUR INVESTMENT", content)
+    out.extend(format_box("💰 YOUR INVESTMENT", content))
     
     # Top Models
     content = []
@@ -272,7 +649,7 @@ def display_summary(data):
         model_name = model['model'].replace('claude-', '').replace('-', ' ')
         model_name = ' '.join(word.capitalize() for word in model_name.split())
         content.append(f"{i}. {model_name:<25} {model['total_tokens_formatted']:>12} ({model['percentage']:>5.1f}%)")
-    print_box("🤖 TOP 5 MODELS", content)
+    out.extend(format_box("🤖 TOP 5 MODELS", content))
     
     # Peak Times
     content = [
@@ -281,20 +658,23 @@ def display_summary(data):
         f"Peak Weekday:       {data['peak_times']['weekday']['day']} ({data['peak_times']['weekday']['tokens_formatted']})",
         f"Peak Month:         {data['peak_times']['month']['month']} ({data['peak_times']['month']['tokens_formatted']})",
     ]
-    print_box("⏰ PEAK TIMES", content)
+    out.extend(format_box("⏰ PEAK TIMES", content))
     
     # Cache Efficiency
     content = [
         f"Cache Hit Rate:     {data['cache_stats']['efficiency_percent']}%",
         f"Tokens from Cache:  {data['cache_stats']['total_cache_read_formatted']}",
     ]
-    print_box("⚡ CACHE EFFICIENCY", content)
+    out.extend(format_box("⚡ CACHE EFFICIENCY", content))
     
     # Footer
-    print("=" * 70)
-    print(" " * 25 + "Thanks for coding!")
-    print(" " * 20 + "See you next year 🚀")
-    print("=" * 70 + "\n")
+    out.append("=" * 70)
+    out.append(" " * 25 + "Thanks for coding!")
+    out.append(" " * 20 + "See you next year 🚀")
+    out.append("=" * 70)
+    out.append("")
+    
+    sys.stdout.write("\n".join(out) + "\n")
 
 def main():
     parser = argparse.ArgumentParser(
@@ -319,7 +699,8 @@ To export your data:
     print(f"Analyzing Cursor usage data from {args.csv_file}...")
     try:
         events = parse_csv(args.csv_file)
-        print(f"Loaded {len(events)} events")
+        stats = analyze_usage(events)
+        print(f"Loaded {stats['loaded_events']} events")
     except FileNotFoundError:
         print(f"Error: File '{args.csv_file}' not found", file=sys.stderr)
         sys.exit(1)
@@ -327,11 +708,10 @@ To export your data:
         print(f"Error reading CSV file: {e}", file=sys.stderr)
         sys.exit(1)
     
-    if not events:
+    if stats['total_events'] == 0:
         print("Error: No valid events found in CSV file", file=sys.stderr)
         sys.exit(1)
     
-    stats = analyze_usage(events)
     summary = generate_summary(stats)
     
     # Display summary
@@ -340,8 +720,12 @@ To export your data:
     # Save JSON if requested
     if args.json:
         try:
-            with open(args.json, 'w') as f:
-                json.dump(summary, f, indent=2, default=str)
+            if orjson is not None:
+                with open(args.json, 'wb') as f:
+                    f.write(orjson.dumps(summary, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+            else:
+                with open(args.json, 'w') as f:
+                    json.dump(summary, f, indent=2, default=str)
             print(f"Summary saved to {args.json}")
         except Exception as e:
             print(f"Warning: Could not save JSON file: {e}", file=sys.stderr)